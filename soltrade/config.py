@@ -54,6 +54,44 @@ class Config:
         # Trading Mode Config
         self.trading_mode = os.getenv("TRADING_MODE", "retail")
 
+        # Sliced Execution: split large swaps into several smaller ones
+        self.execution_slices = int(os.getenv("EXECUTION_SLICES") or 1)
+        self.execution_max_slices = int(os.getenv("EXECUTION_MAX_SLICES") or 10)
+        self.execution_window_seconds = int(os.getenv("EXECUTION_WINDOW_SECONDS") or 0)
+        # Max price impact per slice as a decimal (0.01 = 1%), 0 disables adaptive sizing
+        self.execution_max_price_impact = float(os.getenv("EXECUTION_MAX_PRICE_IMPACT", 0))
+        # Each confirmed swap appends "timestamp,seconds" to this file, empty disables it
+        self.execution_latency_path = os.getenv("EXECUTION_LATENCY_PATH", "")
+
+        # Tick Recorder: append every tick's inputs and decision to this file, empty disables it
+        self.tick_record_path = os.getenv("TICK_RECORD_PATH", "")
+
+        # Quote Racing: request several quote variants at once and keep the best
+        self.quote_direct_routes = os.getenv("QUOTE_DIRECT_ROUTES", "false").lower() == "true"
+        self.quote_max_accounts = int(os.getenv("QUOTE_MAX_ACCOUNTS") or 0)
+        # Base URL of a secondary Jupiter-compatible v6 API (serving /quote and /swap)
+        self.quote_secondary_api = os.getenv("QUOTE_SECONDARY_API", "")
+        self.quote_latency_budget_ms = int(os.getenv("QUOTE_LATENCY_BUDGET_MS") or 1500)
+        # How long other variants may keep racing once the default quote has arrived
+        self.quote_grace_ms = int(os.getenv("QUOTE_GRACE_MS") or 50)
+
+        # Sidecar: shared candle and indicator feed, empty SIDECAR_DIR disables it
+        self.sidecar_dir = os.getenv("SIDECAR_DIR", "")
+        # Symbols published by the sidecar, defaults to SECONDARY_MINT_SYMBOL
+        self.sidecar_symbols = [symbol.strip() for symbol in os.getenv("SIDECAR_SYMBOLS", "").split(",") if symbol.strip()] or [self.secondary_mint_symbol]
+        self.sidecar_slots = int(os.getenv("SIDECAR_SLOTS") or 8)
+        self.sidecar_max_age_seconds = int(os.getenv("SIDECAR_MAX_AGE_SECONDS") or 2 * self.price_update_seconds)
+
+        # Paper Trading: simulated fills against a virtual wallet, no funds or swaps
+        self.paper_trading = os.getenv("PAPER_TRADING", "false").lower() == "true"
+        self.paper_starting_balance = float(os.getenv("PAPER_STARTING_BALANCE", 1000))
+        self.paper_slippage_bps = int(os.getenv("PAPER_SLIPPAGE_BPS") or 10)
+        self.paper_latency_seconds = float(os.getenv("PAPER_LATENCY_SECONDS", 2))
+        # Pool depth in PRIMARY_MINT used to model price impact, 0 disables it
+        self.paper_liquidity = float(os.getenv("PAPER_LIQUIDITY", 0))
+        self.paper_wallet_path = os.getenv("PAPER_WALLET_PATH", "paper_wallet.json")
+        self.paper_position_path = os.getenv("PAPER_POSITION_PATH", "paper_position.json")
+
     @property
     def keypair(self) -> Keypair:
         try:
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Tuple
 
@@ -71,4 +72,82 @@ def calculate_rsi(dataframe: pd.DataFrame, length: int) -> int:
     epsilon = 1e-10
     rsi_ratio = upper_ema / (lower_ema + epsilon)
     rsi = 100 - (100 / (1 + rsi_ratio))
-    return rsi.iat[-1]
\ No newline at end of file
+    return rsi.iat[-1]
+
+def calculate_ema_batch(closes: np.ndarray, length: int) -> np.ndarray:
+    """
+    Calculate the Exponential Moving Average (EMA) for many close series at once.
+
+    Args:
+        closes (np.ndarray): 2D array with one close series per row.
+        length (int): The span for the EMA.
+
+    Returns:
+        np.ndarray: The EMA series for every row, same shape as `closes`.
+
+    Raises:
+        ValueError: If the series do not have enough data points.
+    """
+    if closes.shape[1] < length:
+        raise ValueError("Series do not have enough data points to compute EMA.")
+
+    alpha = 2 / (length + 1)
+    ema = np.empty_like(closes)
+    ema[:, 0] = closes[:, 0]
+    for i in range(1, closes.shape[1]):
+        ema[:, i] = (1 - alpha) * ema[:, i - 1] + alpha * closes[:, i]
+    return ema
+
+
+def calculate_bbands_batch(closes: np.ndarray, length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate the latest upper and lower Bollinger Bands for many close series at once.
+
+    Args:
+        closes (np.ndarray): 2D array with one close series per row.
+        length (int): The window length for the moving average and standard deviation.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The last upper and lower band of every row.
+
+    Raises:
+        ValueError: If the series do not have enough data points.
+    """
+    if closes.shape[1] < length:
+        raise ValueError("Series do not have enough data points to compute Bollinger Bands.")
+
+    window = closes[:, -length:]
+    sma = window.mean(axis=1)
+    std = window.std(axis=1, ddof=1)
+    return sma + std * 2, sma - std * 2
+
+
+def calculate_rsi_batch(closes: np.ndarray, length: int) -> np.ndarray:
+    """
+    Calculate the latest Relative Strength Index (RSI) for many close series at once.
+
+    Args:
+        closes (np.ndarray): 2D array with one close series per row.
+        length (int): The window length for the RSI calculation.
+
+    Returns:
+        np.ndarray: The last RSI value of every row.
+
+    Raises:
+        ValueError: If the series do not have enough data points.
+    """
+    if closes.shape[1] < length:
+        raise ValueError("Series do not have enough data points to compute RSI.")
+
+    delta = np.diff(closes, axis=1)
+    alpha = 1 / length
+    upper_ema = np.clip(delta[:, 0], 0, None)
+    lower_ema = np.abs(np.clip(delta[:, 0], None, 0))
+    for i in range(1, delta.shape[1]):
+        upper_ema = (1 - alpha) * upper_ema + alpha * np.clip(delta[:, i], 0, None)
+        lower_ema = (1 - alpha) * lower_ema + alpha * np.abs(np.clip(delta[:, i], None, 0))
+
+    # Adding epsilon to avoid division by zero
+    epsilon = 1e-10
+    rsi_ratio = upper_ema / (lower_ema + epsilon)
+    return 100 - (100 / (1 + rsi_ratio))
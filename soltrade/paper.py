@@ -0,0 +1,99 @@
+import json
+import os
+import asyncio
+
+from soltrade.log import log_general, log_transaction
+from soltrade.config import config
+
+# Quotes use the same raw unit scale for both mints since no mint account is read
+PAPER_TOKEN_DECIMALS = 10**6
+
+
+class PaperWallet:
+    def __init__(self, path):
+        self.path = path
+        self.balances = {}
+        self.price = 0  # Latest candle close, used as the quoted price
+        self.load_wallet()
+
+    def load_wallet(self):
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                self.balances = json.load(file).get("balances", {})
+        else:
+            self.balances = {config().primary_mint: config().paper_starting_balance}
+            self.save_wallet()
+
+    def save_wallet(self):
+        with open(self.path, 'w') as file:
+            json.dump({"balances": self.balances}, file)
+
+    def balance(self, token_mint: str) -> float:
+        return self.balances.get(token_mint, 0)
+
+    def transfer(self, sent_amount: float, sent_token_mint: str, received_amount: float, received_token_mint: str):
+        self.balances[sent_token_mint] = max(self.balance(sent_token_mint) - sent_amount, 0)
+        self.balances[received_token_mint] = self.balance(received_token_mint) + received_amount
+        self.save_wallet()
+
+
+_wallet_instance = None
+
+
+def paper_wallet() -> PaperWallet:
+    global _wallet_instance
+    if _wallet_instance is None:
+        _wallet_instance = PaperWallet(config().paper_wallet_path)
+    return _wallet_instance
+
+
+# Returns a Jupiter-shaped quote priced at the latest candle close
+# Price impact grows linearly with the trade's value relative to PAPER_LIQUIDITY
+def create_paper_quote(input_amount: float, input_token_mint: str) -> dict:
+    price = paper_wallet().price
+    if price <= 0:
+        raise ValueError("Paper trading has no reference price yet.")
+
+    if input_token_mint == config().primary_mint:
+        output_token_mint = config().secondary_mint
+        trade_value = input_amount
+        output_amount = input_amount / price
+    else:
+        output_token_mint = config().primary_mint
+        trade_value = input_amount * price
+        output_amount = input_amount * price
+
+    liquidity = config().paper_liquidity
+    price_impact = min(trade_value / liquidity, 1) if liquidity > 0 else 0
+    output_amount *= 1 - price_impact
+
+    return {
+        "inputMint": input_token_mint,
+        "outputMint": output_token_mint,
+        "inAmount": str(int(input_amount * PAPER_TOKEN_DECIMALS)),
+        "outAmount": str(int(output_amount * PAPER_TOKEN_DECIMALS)),
+        "slippageBps": config().slippage,
+        "priceImpactPct": str(price_impact)
+    }
+
+
+# Simulates a swap: waits PAPER_LATENCY_SECONDS, then fills the quote less PAPER_SLIPPAGE_BPS
+async def perform_paper_swap(sent_amount: float, sent_token_mint: str) -> dict:
+    log_general.info("Soltrade is taking a paper market position.")
+
+    wallet = paper_wallet()
+    # Allow for float dust left over from summing sliced amounts
+    if sent_amount <= 0 or wallet.balance(sent_token_mint) < sent_amount * (1 - 1e-9):
+        log_general.error(f"Paper wallet only holds {wallet.balance(sent_token_mint)} of {sent_token_mint}; cannot send {sent_amount}.")
+        return None
+
+    await asyncio.sleep(config().paper_latency_seconds)
+    quote = create_paper_quote(sent_amount, sent_token_mint)
+    bought_amount = int(quote['outAmount']) / PAPER_TOKEN_DECIMALS * (1 - config().paper_slippage_bps / 10000)
+    wallet.transfer(sent_amount, sent_token_mint, bought_amount, quote['outputMint'])
+
+    if sent_token_mint == config().primary_mint:
+        log_transaction.info(f"Paper sold {sent_amount} {config().primary_mint_symbol} for {bought_amount:.6f} {config().secondary_mint_symbol}")
+    else:
+        log_transaction.info(f"Paper sold {sent_amount} {config().secondary_mint_symbol} for {bought_amount:.2f} {config().primary_mint_symbol}")
+    return {"in_amount": sent_amount, "out_amount": bought_amount}
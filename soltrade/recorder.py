@@ -0,0 +1,177 @@
+import os
+import time
+
+import numpy as np
+
+from soltrade.strategy import CANDLE_COLUMNS, INDICATOR_FIELDS
+
+# A recording is two append-only files, each a fixed header followed by fixed-size rows:
+# the tick file, and a candle file at `<path>.candles` holding only candles that changed
+# since the previous tick. Each tick says which candles it appended and which time range
+# its window covers, so the full window is rebuilt by merging onto the previous one.
+RECORD_MAGIC = b"SOLTICKS"
+CANDLE_MAGIC = b"SOLCANDL"
+RECORD_VERSION = 2
+HEADER_DTYPE = np.dtype([('magic', 'S8'), ('version', '<u4'), ('itemsize', '<u4')])
+CANDLE_DTYPE = np.dtype(('<f8', (len(CANDLE_COLUMNS),)))
+TIME_COLUMN = CANDLE_COLUMNS.index('time')
+
+# Field order of the thresholds and outputs stored with every tick
+THRESHOLD_FIELDS = ['rsi_buy_threshold', 'rsi_sell_threshold', 'stoploss_multiplier', 'takeprofit_multiplier',
+                    'buy_margin', 'sell_margin', 'trailing_stop_percent']
+OUTPUT_FIELDS = ['sl', 'tp', 'highest_price', 'trailing_stop']
+
+TICK_DTYPE = np.dtype([
+    ('recorded_at', '<f8'),
+    ('candle_start', '<u8'),  # Index of the first candle this tick appended
+    ('candle_new', '<u2'),  # Number of candles this tick appended
+    ('candle_reset', '?'),  # True if the window is only the appended candles
+    ('candle_count', '<u2'),
+    ('candle_first_time', '<f8'),
+    ('candle_last_time', '<f8'),
+    ('degen', '?'),
+    ('thresholds', '<f8', (len(THRESHOLD_FIELDS),)),
+    ('position', '?'),
+    ('state_sl', '<f8'),
+    ('state_tp', '<f8'),
+    ('state_entry_price', '<f8'),
+    ('state_highest_price', '<f8'),
+    ('indicators', '<f8', (len(INDICATOR_FIELDS),)),
+    ('outputs', '<f8', (len(OUTPUT_FIELDS),)),
+    ('buy_decision', '?'),
+    ('sell_decision', '?'),
+])
+
+
+def candle_path(path) -> str:
+    return f"{path}.candles"
+
+
+# Rebuilds a candle window: the previous window with the appended candles replacing or
+# adding rows by time, limited to the window's time range
+def merge_candles(previous: np.ndarray, appended: np.ndarray, first_time: float, last_time: float) -> np.ndarray:
+    if previous is None or len(previous) == 0:
+        combined = appended
+    else:
+        kept = previous[~np.isin(previous[:, TIME_COLUMN], appended[:, TIME_COLUMN])]
+        combined = np.concatenate([kept, appended])
+        combined = combined[np.argsort(combined[:, TIME_COLUMN], kind='stable')]
+    times = combined[:, TIME_COLUMN]
+    return combined[(times >= first_time) & (times <= last_time)]
+
+
+class TickRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.previous = None  # Window of the last recorded tick; a new process starts with a reset
+
+    # Appends one tick's inputs and outputs to the recording
+    # `candles` is the packed window (see strategy.pack_candles)
+    def record(self, candles: np.ndarray, state: dict, thresholds: dict, tick: dict):
+        first_time = candles[0, TIME_COLUMN]
+        last_time = candles[-1, TIME_COLUMN]
+
+        # Only append candles that differ from the previous window, unless merging
+        # them would not reproduce this window exactly
+        reset = True
+        appended = candles
+        if self.previous is not None:
+            unchanged = {row.tobytes() for row in self.previous}
+            changed = np.array([row.tobytes() not in unchanged for row in candles], dtype=bool)
+            merged = merge_candles(self.previous, candles[changed], first_time, last_time)
+            if merged.shape == candles.shape and np.array_equal(merged, candles, equal_nan=True):
+                reset = False
+                appended = candles[changed]
+
+        row = np.zeros(1, dtype=TICK_DTYPE)
+        row['recorded_at'] = time.time()
+        row['candle_new'] = len(appended)
+        row['candle_reset'] = reset
+        row['candle_count'] = len(candles)
+        row['candle_first_time'] = first_time
+        row['candle_last_time'] = last_time
+        row['degen'] = thresholds["trading_mode"].lower() == "degen"
+        row['thresholds'] = [thresholds[field] for field in THRESHOLD_FIELDS]
+        row['position'] = bool(state["position"])
+        row['state_sl'] = state["sl"]
+        row['state_tp'] = state["tp"]
+        row['state_entry_price'] = state["entry_price"]
+        row['state_highest_price'] = state["highest_price"]
+        row['indicators'] = [tick[field] for field in INDICATOR_FIELDS]
+        row['outputs'] = [tick[field] for field in OUTPUT_FIELDS]
+        row['buy_decision'] = tick["buy_decision"]
+        row['sell_decision'] = tick["sell_decision"]
+
+        # Candles are written first, so a tick never references candles that are missing
+        with open(candle_path(self.path), 'ab') as file:
+            if file.tell() == 0:
+                file.write(np.array([(CANDLE_MAGIC, RECORD_VERSION, CANDLE_DTYPE.itemsize)], dtype=HEADER_DTYPE).tobytes())
+            row['candle_start'] = (file.tell() - HEADER_DTYPE.itemsize) // CANDLE_DTYPE.itemsize
+            file.write(np.ascontiguousarray(appended, dtype='<f8').tobytes())
+
+        with open(self.path, 'ab') as file:
+            if file.tell() == 0:
+                file.write(np.array([(RECORD_MAGIC, RECORD_VERSION, TICK_DTYPE.itemsize)], dtype=HEADER_DTYPE).tobytes())
+            file.write(row.tobytes())
+
+        self.previous = np.array(candles, dtype='float64')
+
+
+_recorder_instance = None
+
+
+def tick_recorder(path=None):
+    global _recorder_instance
+    if _recorder_instance is None and path is not None:
+        _recorder_instance = TickRecorder(path)
+    return _recorder_instance
+
+
+# Memory-maps one of the recording's files after checking its header
+# A partially written trailing row (e.g. from a crash) is ignored
+def load_rows(path, magic, dtype) -> np.ndarray:
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) == 0 or header['magic'][0] != magic:
+        raise ValueError(f"{path} is not a soltrade tick recording.")
+    if header['version'][0] != RECORD_VERSION or header['itemsize'][0] != dtype.itemsize:
+        raise ValueError(f"{path} was recorded with an incompatible format version.")
+
+    count = (os.path.getsize(path) - HEADER_DTYPE.itemsize) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+
+
+# Memory-maps a recording as its ticks (one structured row per tick) and its candle rows
+def load_ticks(path) -> tuple:
+    ticks = load_rows(path, RECORD_MAGIC, TICK_DTYPE)
+    candles = load_rows(candle_path(path), CANDLE_MAGIC, CANDLE_DTYPE)
+    return ticks, candles
+
+
+# Yields the full candle window of every tick in order, rebuilt from the appended candles
+def iter_windows(ticks: np.ndarray, candles: np.ndarray):
+    window = None
+    for row in ticks:
+        start = int(row['candle_start'])
+        appended = candles[start:start + int(row['candle_new'])]
+        if row['candle_reset']:
+            window = np.array(appended)
+        else:
+            window = merge_candles(window, appended, row['candle_first_time'], row['candle_last_time'])
+        yield window
+
+
+# Rebuilds the evaluate_tick state and thresholds from a recorded tick
+def tick_inputs(row) -> tuple:
+    thresholds = dict(zip(THRESHOLD_FIELDS, (float(value) for value in row['thresholds'])))
+    thresholds["trading_mode"] = "degen" if row['degen'] else "retail"
+
+    state = {
+        "position": bool(row['position']),
+        "sl": float(row['state_sl']),
+        "tp": float(row['state_tp']),
+        "entry_price": float(row['state_entry_price']),
+        "highest_price": float(row['state_highest_price'])
+    }
+    return state, thresholds
@@ -0,0 +1,90 @@
+import argparse
+import time
+
+import numpy as np
+
+from soltrade.recorder import load_ticks, iter_windows, tick_inputs, OUTPUT_FIELDS
+from soltrade.strategy import CANDLE_COLUMNS, INDICATOR_FIELDS, compute_indicator_batch, evaluate_tick, resolve_thresholds
+
+# Number of ticks whose indicators are computed together
+REPLAY_CHUNK = 4096
+CLOSE_COLUMN = CANDLE_COLUMNS.index('close')
+
+
+# Computes the indicators of every recorded tick, batching ticks whose windows have the same length
+def replay_indicators(ticks, candles) -> np.ndarray:
+    indicators = np.full((len(ticks), len(INDICATOR_FIELDS)), np.nan)
+    pending = {}  # window length -> (tick indexes, close rows)
+
+    def flush(length):
+        indexes, closes = pending.pop(length)
+        batch = compute_indicator_batch(np.array(closes))
+        indicators[indexes] = np.column_stack([batch[field] for field in INDICATOR_FIELDS])
+
+    for index, window in enumerate(iter_windows(ticks, candles)):
+        indexes, closes = pending.setdefault(len(window), ([], []))
+        indexes.append(index)
+        closes.append(window[:, CLOSE_COLUMN])
+        if len(indexes) >= REPLAY_CHUNK:
+            flush(len(window))
+    for length in list(pending):
+        flush(length)
+    return indicators
+
+
+# Feeds a tick recording back through the decision logic and reports every tick
+# where the decision or the derived position values differ from the recording
+# Returns the number of ticks replayed and the mismatching ticks
+def replay(path, use_current_config=False, limit=None) -> tuple:
+    ticks, candles = load_ticks(path)
+    if limit is not None:
+        ticks = ticks[:limit]
+    current_thresholds = resolve_thresholds() if use_current_config else None
+
+    indicators = replay_indicators(ticks, candles)
+    indicator_mismatch = ~np.all((indicators == ticks['indicators']) |
+                                 (np.isnan(indicators) & np.isnan(ticks['indicators'])), axis=1)
+
+    mismatches = []
+    for index, row in enumerate(ticks):
+        state, thresholds = tick_inputs(row)
+        tick = evaluate_tick(None, state, current_thresholds or thresholds,
+                             dict(zip(INDICATOR_FIELDS, (float(value) for value in indicators[index]))))
+
+        replayed_outputs = np.array([tick[field] for field in OUTPUT_FIELDS], dtype='float64')
+        differences = []
+        if tick["buy_decision"] != row['buy_decision']:
+            differences.append(f"buy {bool(row['buy_decision'])} -> {tick['buy_decision']}")
+        if tick["sell_decision"] != row['sell_decision']:
+            differences.append(f"sell {bool(row['sell_decision'])} -> {tick['sell_decision']}")
+        if not np.array_equal(replayed_outputs, row['outputs'], equal_nan=True):
+            differences.append("position values changed")
+        if indicator_mismatch[index]:
+            differences.append("indicator values changed")
+
+        if differences:
+            mismatches.append((index, float(row['recorded_at']), differences))
+
+    return len(ticks), mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a soltrade tick recording through the decision logic.")
+    parser.add_argument("path", help="Tick recording written via TICK_RECORD_PATH")
+    parser.add_argument("--current-config", action="store_true", help="Use thresholds from the current .env instead of the recorded ones")
+    parser.add_argument("--limit", type=int, default=None, help="Only replay the first N ticks")
+    parser.add_argument("--show", type=int, default=20, help="Number of mismatching ticks to print")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    total, mismatches = replay(args.path, use_current_config=args.current_config, limit=args.limit)
+    elapsed = time.perf_counter() - started
+
+    for index, recorded_at, differences in mismatches[:args.show]:
+        print(f"Tick {index} ({time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(recorded_at))}): {', '.join(differences)}")
+    print(f"Replayed {total} ticks in {elapsed:.2f}s; {len(mismatches)} differed from the recording.")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+import os
+import mmap
+import time
+
+import numpy as np
+import pandas as pd
+
+from apscheduler.schedulers.background import BlockingScheduler
+
+from soltrade.strategy import CANDLE_ROWS, CANDLE_COLUMNS, INDICATOR_FIELDS, fetch_candlestick, build_candle_frame, \
+    compute_indicators, pack_candles
+from soltrade.log import log_general
+from soltrade.config import config
+
+# Each ring file is a header followed by `slot_count` slots; the header's sequence is the
+# last published slot and each slot is bracketed by its sequence so readers can detect torn reads
+RING_MAGIC = b"SOLRING1"
+RING_VERSION = 1
+RING_HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('slot_count', '<u4'),
+    ('slot_size', '<u4'),
+    ('sequence', '<u8'),
+])
+SLOT_DTYPE = np.dtype([
+    ('seq_begin', '<u8'),
+    ('published_at', '<f8'),
+    ('candle_count', '<u2'),
+    ('candles', '<f8', (CANDLE_ROWS, len(CANDLE_COLUMNS))),
+    ('indicators', '<f8', (len(INDICATOR_FIELDS),)),
+    ('seq_end', '<u8'),
+])
+
+
+# Ring files are keyed by everything that changes the candles, so bots only attach to matching data
+def ring_path(symbol: str) -> str:
+    name = f"{symbol}-{config().primary_mint_symbol}-{config().trading_interval_minutes}m.ring"
+    return os.path.join(config().sidecar_dir, name)
+
+
+class CandleRingWriter:
+    def __init__(self, path, slot_count):
+        self.path = path
+        self.slot_count = slot_count
+        size = RING_HEADER_DTYPE.itemsize + slot_count * SLOT_DTYPE.itemsize
+
+        # A new ring is built beside the old one and swapped in, so attached readers
+        # keep a valid mapping of the old file instead of seeing it truncated
+        if not self.is_compatible(path, size):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as file:
+                file.truncate(size)
+                header = np.zeros((), dtype=RING_HEADER_DTYPE)
+                header['magic'] = RING_MAGIC
+                header['version'] = RING_VERSION
+                header['slot_count'] = slot_count
+                header['slot_size'] = SLOT_DTYPE.itemsize
+                file.write(header.tobytes())
+            os.replace(temp_path, path)
+
+        self.file = open(path, 'r+b')
+        self.buffer = mmap.mmap(self.file.fileno(), size)
+        self.header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=self.buffer)
+        self.slots = np.ndarray((slot_count,), dtype=SLOT_DTYPE, buffer=self.buffer, offset=RING_HEADER_DTYPE.itemsize)
+
+    @staticmethod
+    def is_compatible(path, size) -> bool:
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            return False
+        header = np.fromfile(path, dtype=RING_HEADER_DTYPE, count=1)
+        return header['magic'][0] == RING_MAGIC and header['version'][0] == RING_VERSION and \
+            header['slot_size'][0] == SLOT_DTYPE.itemsize
+
+    # Writes the candles and indicators into the next slot, then advances the sequence
+    def publish(self, df: pd.DataFrame, indicators: dict) -> int:
+        sequence = int(self.header['sequence']) + 1
+        index = sequence % self.slot_count
+        candles = pack_candles(df)
+
+        self.slots['seq_begin'][index] = sequence
+        self.slots['published_at'][index] = time.time()
+        self.slots['candle_count'][index] = len(candles)
+        self.slots['candles'][index, :len(candles)] = candles
+        self.slots['indicators'][index] = [indicators[field] for field in INDICATOR_FIELDS]
+        self.slots['seq_end'][index] = sequence
+        self.header['sequence'] = sequence
+        return sequence
+
+
+class CandleRingReader:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.inode = os.fstat(file.fileno()).st_ino
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.header = np.ndarray((), dtype=RING_HEADER_DTYPE, buffer=self.buffer)
+        if self.header['magic'] != RING_MAGIC or self.header['version'] != RING_VERSION or \
+                self.header['slot_size'] != SLOT_DTYPE.itemsize:
+            raise ValueError(f"{path} is not a compatible soltrade candle ring.")
+        self.slot_count = int(self.header['slot_count'])
+        self.slots = np.ndarray((self.slot_count,), dtype=SLOT_DTYPE, buffer=self.buffer, offset=RING_HEADER_DTYPE.itemsize)
+
+    # True once the sidecar has swapped in a new ring file at the same path
+    def is_replaced(self) -> bool:
+        try:
+            return os.stat(self.path).st_ino != self.inode
+        except FileNotFoundError:
+            return True
+
+    # Returns (sequence, slot) for the latest complete slot; the slot is a view into the shared mapping
+    def latest(self) -> tuple:
+        sequence = int(self.header['sequence'])
+        if sequence == 0:
+            return None
+        slot = self.slots[sequence % self.slot_count]
+        if slot['seq_begin'] != sequence or slot['seq_end'] != sequence:
+            return None
+        return sequence, slot
+
+    # False if the slot read under `sequence` has since been reused by the writer
+    def is_current(self, sequence: int) -> bool:
+        return self.slots['seq_begin'][sequence % self.slot_count] == sequence
+
+
+_reader_instances = {}
+
+
+def ring_reader(path):
+    reader = _reader_instances.get(path)
+    if reader is None or reader.is_replaced():
+        try:
+            reader = CandleRingReader(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        _reader_instances[path] = reader
+    return reader
+
+
+# Returns the latest candles and indicators published for the symbol, or None if the
+# sidecar is not running or its data is stale
+# The candles are packed (see strategy.pack_candles) and are a view into the shared mapping
+def read_sidecar(symbol: str) -> tuple:
+    reader = ring_reader(ring_path(symbol))
+    latest = reader.latest() if reader else None
+    if latest is None:
+        log_general.debug(f"No sidecar data for {symbol}; fetching candles directly.")
+        return None
+
+    sequence, slot = latest
+    age = time.time() - slot['published_at']
+    if age > config().sidecar_max_age_seconds:
+        log_general.warning(f"Sidecar data for {symbol} is {age:.0f}s old; fetching candles directly.")
+        return None
+
+    candles = slot['candles'][:slot['candle_count']]
+    indicators = dict(zip(INDICATOR_FIELDS, (float(value) for value in slot['indicators'])))
+    if not reader.is_current(sequence):
+        return None
+    return candles, indicators
+
+
+# Fetches candles and publishes indicators for every configured symbol
+def publish_candles(writers: dict):
+    for symbol, writer in writers.items():
+        try:
+            candle_json = fetch_candlestick(symbol)
+            df = build_candle_frame(candle_json["Data"]["Data"])
+            sequence = writer.publish(df, compute_indicators(df))
+            log_general.debug(f"Sidecar published {symbol} sequence {sequence}.")
+        # fetch_candlestick exits on API errors; keep serving the other symbols
+        except (Exception, SystemExit) as e:
+            log_general.error(f"Sidecar failed to publish {symbol}: {e}")
+
+
+# This starts the sidecar publishing on a timer
+def start_sidecar():
+    if not config().sidecar_dir:
+        log_general.error("SIDECAR_DIR must be set to run the sidecar.")
+        exit()
+
+    writers = {symbol: CandleRingWriter(ring_path(symbol), config().sidecar_slots) for symbol in config().sidecar_symbols}
+    log_general.info(f"Soltrade sidecar is publishing {', '.join(writers)} to {config().sidecar_dir}.")
+    publish_candles(writers)
+
+    sidecar_sched = BlockingScheduler()
+    sidecar_sched.add_job(publish_candles, 'interval', seconds=config().price_update_seconds, args=[writers], max_instances=1)
+    sidecar_sched.start()
+
+
+if __name__ == "__main__":
+    start_sidecar()
@@ -0,0 +1,219 @@
+import requests
+import numpy as np
+import pandas as pd
+
+from soltrade.indicators import calculate_ema_batch, calculate_rsi_batch, calculate_bbands_batch
+from soltrade.log import log_general
+from soltrade.config import config
+
+# Number of candles requested from CryptoCompare (the API returns limit + 1 rows)
+CANDLE_LIMIT = 50
+CANDLE_ROWS = CANDLE_LIMIT + 1
+CANDLE_COLUMNS = ['close', 'high', 'low', 'open', 'time', 'VF', 'VT']
+INDICATOR_FIELDS = ['price', 'ema_short', 'ema_medium', 'prev_ema_medium', 'rsi', 'upper_bb', 'lower_bb']
+
+
+# Pulls the candlestick information in fifteen minute intervals
+def fetch_candlestick(symbol: str = None) -> dict:
+    url = "https://min-api.cryptocompare.com/data/v2/histominute"
+    headers = {'authorization': config().api_key}
+    params = {'tsym': config().primary_mint_symbol, 'fsym': symbol or config().secondary_mint_symbol, 'limit': CANDLE_LIMIT, 'aggregate': config().trading_interval_minutes}
+    
+    response = requests.get(url, headers=headers, params=params)
+    response_json = response.json()
+    
+    # Log only the API status code instead of full response
+    if response.status_code != 200:
+        log_general.error(f"API Error: {response.status_code} {response.reason}")
+        exit()
+    
+    log_general.debug(f"API Response: {response.status_code} {response.reason}")
+    return response_json
+
+
+# Builds the analysis DataFrame from the raw candle rows returned by CryptoCompare
+def build_candle_frame(candle_dict) -> pd.DataFrame:
+    df = pd.DataFrame(candle_dict, columns=CANDLE_COLUMNS)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    return df
+
+
+# Packs the candle frame into a float64 array with the time as epoch seconds
+def pack_candles(df: pd.DataFrame) -> np.ndarray:
+    candles = df[CANDLE_COLUMNS].tail(CANDLE_ROWS).copy()
+    candles['time'] = candles['time'].astype('int64') // 10**9
+    return candles.to_numpy(dtype='float64')
+
+
+# Resolves the thresholds for the configured trading mode
+def resolve_thresholds() -> dict:
+    trading_mode = config().trading_mode
+
+    if trading_mode.lower() == "degen":
+        rsi_buy_threshold = config().degen_rsi_buy_threshold
+        rsi_sell_threshold = config().degen_rsi_sell_threshold
+        stoploss_multiplier = config().degen_stoploss_percent
+        takeprofit_multiplier = config().degen_takeprofit_percent
+    else:
+        rsi_buy_threshold = config().rsi_buy_threshold
+        rsi_sell_threshold = config().rsi_sell_threshold
+        stoploss_multiplier = config().stoploss_percent
+        takeprofit_multiplier = config().takeprofit_percent
+
+    return {
+        "trading_mode": trading_mode,
+        "rsi_buy_threshold": rsi_buy_threshold,
+        "rsi_sell_threshold": rsi_sell_threshold,
+        "stoploss_multiplier": stoploss_multiplier,
+        "takeprofit_multiplier": takeprofit_multiplier,
+        # Add margin variables for more flexible buy/sell triggers
+        "buy_margin": getattr(config(), 'buy_margin_percent', 0),
+        "sell_margin": getattr(config(), 'sell_margin_percent', 0),
+        # Trailing stop percent from config (default 5%)
+        "trailing_stop_percent": getattr(config(), 'trailing_stop_percent', 0.05),
+    }
+
+
+# Computes the latest value of every indicator the strategy uses for many close series
+# at once (one per row), so live ticks and replay share the exact same arithmetic
+def compute_indicator_batch(closes: np.ndarray) -> dict:
+    ema_medium = calculate_ema_batch(closes, length=20)
+    upper_bb, lower_bb = calculate_bbands_batch(closes, length=14)
+    return {
+        "price": closes[:, -1],
+        "ema_short": calculate_ema_batch(closes, length=5)[:, -1],
+        "ema_medium": ema_medium[:, -1],
+        # Previous medium EMA, used to determine the trend bias
+        "prev_ema_medium": ema_medium[:, -2],
+        "rsi": calculate_rsi_batch(closes, length=14),
+        "upper_bb": upper_bb,
+        "lower_bb": lower_bb,
+    }
+
+
+# Computes the latest value of every indicator the strategy uses
+def compute_indicators(df: pd.DataFrame) -> dict:
+    batch = compute_indicator_batch(df['close'].to_numpy(dtype='float64')[np.newaxis, :])
+    return {field: float(values[0]) for field, values in batch.items()}
+
+
+# Computes the buy/sell decision for one tick without any side effects
+# `state` holds the position before the tick: position, sl, tp, entry_price, highest_price
+# `indicators` may be supplied precomputed (e.g. by the sidecar), otherwise they are computed from `df`
+def evaluate_tick(df: pd.DataFrame, state: dict, thresholds: dict, indicators: dict = None) -> dict:
+    if indicators is None:
+        indicators = compute_indicators(df)
+
+    # Technical analysis values
+    price = indicators["price"]
+    ema_short = indicators["ema_short"]
+    ema_medium = indicators["ema_medium"]
+    rsi = indicators["rsi"]
+    upper_bb = indicators["upper_bb"]
+    lower_bb = indicators["lower_bb"]
+
+    # Determine trend bias by comparing the current medium EMA to its previous value
+    prev_ema_medium = indicators["prev_ema_medium"]
+    trend_bias = ema_medium > prev_ema_medium
+
+    trading_mode = thresholds["trading_mode"]
+    # Set buy logic mode based on trading mode
+    buy_logic_mode = 'loose' if trading_mode.lower() == 'degen' else 'strict'
+
+    rsi_buy_threshold = thresholds["rsi_buy_threshold"]
+    rsi_sell_threshold = thresholds["rsi_sell_threshold"]
+    buy_margin = thresholds["buy_margin"]
+    sell_margin = thresholds["sell_margin"]
+
+    # ------------------------------
+    # Margin logic:
+    # BUY_MARGIN_PERCENT allows buy triggers to activate slightly before crossing exact thresholds (BB, RSI).
+    # SELL_MARGIN_PERCENT allows sell triggers like RSI to hit slightly early.
+    # These are configurable in the .env file and default to 0 if not set.
+    # ------------------------------
+
+    # Precompute margin-adjusted targets so they're always available
+    bb_target = lower_bb * (1 + buy_margin)
+    rsi_target = rsi_buy_threshold * (1 + buy_margin)
+
+    position = state["position"]
+    entry_price = state["entry_price"]
+    stoploss = state["sl"]
+    takeprofit = state["tp"]
+    highest_price = state["highest_price"]
+
+    # Recalculate the expected stoploss and takeprofit based on current config values
+    sl_tp_updated = False
+    if position and entry_price > 0:
+        expected_stoploss = entry_price * thresholds["stoploss_multiplier"]
+        expected_takeprofit = entry_price * thresholds["takeprofit_multiplier"]
+
+        if abs(stoploss - expected_stoploss) > 0.000001 or abs(takeprofit - expected_takeprofit) > 0.000001:
+            stoploss = expected_stoploss
+            takeprofit = expected_takeprofit
+            sl_tp_updated = True
+
+    # If highest_price is not yet set, initialize it at the current price.
+    highest_price_updated = False
+    if highest_price == 0:
+        highest_price = price
+        trailing_stop = 0
+    elif price > highest_price:
+        highest_price = price
+        highest_price_updated = True
+        trailing_stop = highest_price * (1 - thresholds["trailing_stop_percent"])
+    else:
+        trailing_stop = 0
+
+    # Trade conditions using configurable thresholds
+    ema_target = ema_medium * (1 - buy_margin)
+    ema_crossover = ema_short >= ema_target
+    buy_condition1 = ema_crossover or price <= bb_target
+
+    # In degen mode, only buy if we're in an uptrend,
+    # the price is under the lower Bollinger Band,
+    # and RSI is below the dynamic threshold from config
+    if trading_mode.lower() == "degen":
+        if buy_logic_mode == "loose":
+            # Loose mode: Buy if trend is up and either BB dip OR RSI dip
+            final_buy_decision = trend_bias and (price <= bb_target or rsi <= rsi_target)
+        else:
+            # Strict mode: Buy only if all conditions are met
+            final_buy_decision = trend_bias and price <= bb_target and rsi <= rsi_target
+    else:
+        final_buy_decision = buy_condition1 and (rsi <= rsi_buy_threshold)
+
+    # Sell if the price falls below the stoploss or the trailing stop,
+    # or on an overbought trend reversal.
+    ema_sell_target = ema_medium * (1 + sell_margin)
+    ema_reversal = ema_short <= ema_sell_target
+    sell_condition1 = price <= stoploss or (position and price < trailing_stop)
+    sell_condition2 = ema_reversal or price > upper_bb
+    rsi_sell_target = rsi_sell_threshold * (1 - sell_margin)
+    sell_condition3 = rsi >= rsi_sell_target
+    final_sell_decision = sell_condition1 or (sell_condition2 and sell_condition3)
+
+    return {
+        "price": price,
+        "ema_short": ema_short,
+        "ema_medium": ema_medium,
+        "prev_ema_medium": prev_ema_medium,
+        "rsi": rsi,
+        "upper_bb": upper_bb,
+        "lower_bb": lower_bb,
+        "trend_bias": bool(trend_bias),
+        "buy_logic_mode": buy_logic_mode,
+        "sl": stoploss,
+        "tp": takeprofit,
+        "sl_tp_updated": sl_tp_updated,
+        "highest_price": highest_price,
+        "highest_price_updated": highest_price_updated,
+        "trailing_stop": trailing_stop,
+        "buy_condition1": bool(buy_condition1),
+        "rsi_sell_target": rsi_sell_target,
+        "sell_condition1": bool(sell_condition1),
+        "sell_condition2": bool(sell_condition2),
+        "sell_condition3": bool(sell_condition3),
+        "buy_decision": bool(final_buy_decision),
+        "sell_decision": bool(final_sell_decision),
+    }
@@ -1,7 +1,9 @@
 import httpx
 import json
 import asyncio
+import math
 import os
+import time
 
 import base64
 from solana.rpc.types import TxOpts
@@ -12,6 +14,11 @@ from solders import message
 
 from soltrade.log import log_general, log_transaction
 from soltrade.config import config
+from soltrade.paper import create_paper_quote, perform_paper_swap
+
+
+JUPITER_API = "https://quote-api.jup.ag/v6"
+QUOTE_API_KEY = "_apiBase"  # Added to quotes by fetch_quote, stripped before building the swap
 
 
 class MarketPosition:
@@ -72,6 +79,9 @@ def market(path=None):
 async def create_exchange(input_amount: int, input_token_mint: str) -> dict:
     log_transaction.info(f"Soltrade is creating exchange for {input_amount} {input_token_mint}")
 
+    if config().paper_trading:
+        return create_paper_quote(input_amount, input_token_mint)
+
     # Determines what mint address should be used in the api link
     if input_token_mint == config().primary_mint:
         output_token_mint = config().secondary_mint
@@ -80,12 +90,66 @@ async def create_exchange(input_amount: int, input_token_mint: str) -> dict:
         output_token_mint = config().primary_mint
         token_decimals = config().decimals
     
-    # Finds the response and converts it into a readable array
-    api_link = f"https://quote-api.jup.ag/v6/quote?inputMint={input_token_mint}&outputMint={output_token_mint}&amount={int(input_amount * token_decimals)}&slippageBps={config().slippage}"
-    log_transaction.info(f"Soltrade API Link: {api_link}")
+    base_params = {
+        "inputMint": input_token_mint,
+        "outputMint": output_token_mint,
+        "amount": int(input_amount * token_decimals)
+    }
+    variants = quote_variants()
+    log_transaction.info(f"Soltrade is requesting {len(variants)} quote variant(s) for {base_params}")
+
+    # Races every variant at once and keeps the best quote that arrives within the latency budget.
+    # Once the default variant answers, the others only get a short grace period to beat it.
     async with httpx.AsyncClient() as client:
-        response = await client.get(api_link)
-        return response.json()
+        tasks = [asyncio.create_task(fetch_quote(client, api_base, {**base_params, **params})) for api_base, params in variants]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + config().quote_latency_budget_ms / 1000
+        await asyncio.wait(tasks[:1], timeout=config().quote_latency_budget_ms / 1000)
+        grace = min(config().quote_grace_ms / 1000, max(deadline - loop.time(), 0))
+        done, pending = await asyncio.wait(tasks, timeout=grace)
+
+        # Nothing usable within the budget, so fall back to the first usable quote
+        while pending and not any("outAmount" in task.result() for task in done if not task.exception()):
+            finished, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            done |= finished
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # Kept in variant order so ties resolve to the default variant
+    quotes = [task.result() for task in tasks if task in done and not task.exception()]
+
+    routed_quotes = [quote for quote in quotes if "outAmount" in quote]
+    if not routed_quotes:
+        log_transaction.warning("Soltrade did not receive a usable quote from any variant.")
+        return quotes[0] if quotes else {}
+
+    # Prefer the highest expected output; ties go to the earliest variant, i.e. the default one
+    best_quote = max(routed_quotes, key=lambda quote: int(quote["outAmount"]))
+    log_transaction.info(f"Soltrade picked the quote from {best_quote[QUOTE_API_KEY]} with outAmount {best_quote['outAmount']} out of {len(routed_quotes)} quote(s)")
+    return best_quote
+
+
+# Builds the (api base, query parameters) pairs raced by create_exchange, default variant first
+# Every variant uses SLIPPAGE: outAmount does not depend on slippageBps, so slippage levels never compete
+def quote_variants() -> list:
+    variants = [(JUPITER_API, {"slippageBps": config().slippage})]
+    if config().quote_direct_routes:
+        variants.append((JUPITER_API, {"slippageBps": config().slippage, "onlyDirectRoutes": "true"}))
+    if config().quote_max_accounts > 0:
+        variants.append((JUPITER_API, {"slippageBps": config().slippage, "maxAccounts": config().quote_max_accounts}))
+    if config().quote_secondary_api:
+        variants.append((config().quote_secondary_api.rstrip("/"), {"slippageBps": config().slippage}))
+    return variants
+
+
+# Requests one quote and tags it with the API it came from
+async def fetch_quote(client: httpx.AsyncClient, api_base: str, params: dict) -> dict:
+    response = await client.get(f"{api_base}/quote", params=params)
+    quote = response.json()
+    quote[QUOTE_API_KEY] = api_base
+    return quote
 
 
 # Returns the swap_transaction to be manipulated in sendTransaction()
@@ -93,9 +157,13 @@ async def create_transaction(quote: dict) -> dict:
     log_transaction.info(f"""Soltrade is creating transaction for the following quote: 
 {quote}""")
 
+    # The swap must be built by the same API that produced the quote
+    api_base = quote.get(QUOTE_API_KEY, JUPITER_API)
+    quote_response = {key: value for key, value in quote.items() if key != QUOTE_API_KEY}
+
     # Parameters used for the Jupiter POST request
     parameters = {
-        "quoteResponse": quote,
+        "quoteResponse": quote_response,
         "userPublicKey": str(config().public_address),
         "wrapUnwrapSOL": True,
         "computeUnitPriceMicroLamports": 20 * 14000  # fee of roughly $.04  :shrug:
@@ -103,7 +171,7 @@ async def create_transaction(quote: dict) -> dict:
 
     # Returns the JSON parsed response of Jupiter
     async with httpx.AsyncClient() as client:
-        response = await client.post("https://quote-api.jup.ag/v6/swap", json=parameters)
+        response = await client.post(f"{api_base}/swap", json=parameters)
         return response.json()
 
 
@@ -129,17 +197,23 @@ def find_last_valid_block_height() -> dict:
     return parsed_response
 
 # Uses the previous functions and parameters to exchange Solana token currencies
-async def perform_swap(sent_amount: float, sent_token_mint: str):
-    global position
+# Returns the filled amounts, or None if the swap could not be completed
+async def execute_swap(sent_amount: float, sent_token_mint: str, quote: dict = None) -> dict:
+    if config().paper_trading:
+        return await perform_paper_swap(sent_amount, sent_token_mint)
+
     log_general.info("Soltrade is taking a market position.")
 
-    quote = trans = opts = txid = tx_error = None
+    started = time.monotonic()
+    trans = opts = txid = tx_error = None
     is_tx_successful = False
 
     for i in range(0, 3):
         if not is_tx_successful:
             try:
-                quote = await create_exchange(sent_amount, sent_token_mint)
+                # A quote prefetched by the caller is only used on the first attempt
+                if quote is None or i > 0:
+                    quote = await create_exchange(sent_amount, sent_token_mint)
                 trans = await create_transaction(quote)
                 opts = TxOpts(skip_preflight=False, preflight_commitment="confirmed", last_valid_block_height=find_last_valid_block_height())
                 txid = send_transaction(trans["swapTransaction"], opts)
@@ -164,7 +238,7 @@ async def perform_swap(sent_amount: float, sent_token_mint: str):
 
     if tx_error or not is_tx_successful:
         log_general.error("Soltrade failed to complete the transaction due to slippage issues with Jupiter.")
-        return False
+        return None
 
     if sent_token_mint == config().primary_mint:
         decimals = config().decimals
@@ -174,4 +248,97 @@ async def perform_swap(sent_amount: float, sent_token_mint: str):
         usdc_decimals = 10**6 # TODO: make this a constant variable in utils.py
         bought_amount = int(quote['outAmount']) / usdc_decimals
         log_transaction.info(f"Sold {sent_amount} {config().secondary_mint_symbol} for {bought_amount:.2f} {config().primary_mint_symbol}")
-    return True
+
+    latency = time.monotonic() - started
+    if config().execution_latency_path:
+        record_latency(config().execution_latency_path, latency)
+    return {"in_amount": sent_amount, "out_amount": bought_amount, "latency": latency}
+
+
+# Appends the time from quote to confirmed swap, used to sample backtest execution delays
+def record_latency(path: str, latency: float):
+    with open(path, 'a') as file:
+        file.write(f"{int(time.time())},{latency:.3f}\n")
+
+
+def quoted_price_impact(quote: dict) -> float:
+    return abs(float(quote.get("priceImpactPct") or 0))
+
+
+# Splits a swap into slices spread over EXECUTION_WINDOW_SECONDS, shrinking each slice
+# until the quoted priceImpactPct fits within EXECUTION_MAX_PRICE_IMPACT
+# Returns the aggregate fill, or None if no slice was filled
+async def perform_sliced_swap(sent_amount: float, sent_token_mint: str) -> dict:
+    planned_slices = max(config().execution_slices, 1)
+    max_slices = max(config().execution_max_slices, planned_slices)
+    impact_budget = config().execution_max_price_impact
+    window_seconds = config().execution_window_seconds
+    deadline = time.monotonic() + window_seconds
+
+    remaining = sent_amount
+    total_in = total_out = 0
+    executed = 0
+    last_slice_amount = None
+
+    while remaining > 0 and executed < max_slices:
+        # Estimate the slices left from the last executed slice, so slices added by
+        # adaptive sizing are spread over the window instead of run back-to-back
+        slices_left = max(planned_slices - executed, 1)
+        if last_slice_amount:
+            slices_left = max(slices_left, math.ceil(remaining / last_slice_amount - 1e-9))
+        slices_left = min(slices_left, max_slices - executed)
+
+        # Spread the time left in the window over the slices left
+        if executed > 0 and window_seconds > 0:
+            slice_delay = (deadline - time.monotonic()) / slices_left
+            if slice_delay > 0:
+                await asyncio.sleep(slice_delay)
+
+        last_slice = executed == max_slices - 1
+        slice_amount = remaining / slices_left
+        quote = None
+
+        # Shrink the slice until its quote fits the impact budget, but never so small
+        # that the remainder cannot be filled within the maximum number of slices
+        if impact_budget > 0:
+            min_slice = remaining if last_slice else remaining / (max_slices - executed)
+            quote = await create_exchange(slice_amount, sent_token_mint)
+            price_impact = quoted_price_impact(quote)
+            while price_impact > impact_budget and slice_amount > min_slice:
+                slice_amount = max(slice_amount * impact_budget / price_impact, min_slice)
+                log_transaction.info(f"Quoted price impact {price_impact:.4%} exceeds budget of {impact_budget:.4%}; reducing slice to {slice_amount}")
+                quote = await create_exchange(slice_amount, sent_token_mint)
+                price_impact = quoted_price_impact(quote)
+
+            if price_impact > impact_budget:
+                log_transaction.warning(f"Slice {executed + 1} of {slice_amount} is quoted at {price_impact:.4%} impact, over the {impact_budget:.4%} budget, to stay within {max_slices} slices.")
+
+        log_transaction.info(f"Soltrade is executing slice {executed + 1} for {slice_amount} of {sent_amount}")
+        fill = await execute_swap(slice_amount, sent_token_mint, quote=quote)
+        if fill is None:
+            log_transaction.warning(f"Slice {executed + 1} failed; {remaining} left unfilled.")
+            break
+
+        total_in += fill["in_amount"]
+        total_out += fill["out_amount"]
+        remaining -= slice_amount
+        last_slice_amount = slice_amount
+        executed += 1
+
+    if executed == 0 or total_in <= 0 or total_out <= 0:
+        return None
+
+    # Price is always quoted as primary per secondary, matching the candle prices
+    if sent_token_mint == config().primary_mint:
+        fill_price = total_in / total_out
+    else:
+        fill_price = total_out / total_in
+
+    log_transaction.info(f"Soltrade filled {total_in} of {sent_amount} in {executed} slice(s) at an average price of {fill_price:.6f}")
+    return {
+        "in_amount": total_in,
+        "out_amount": total_out,
+        "remaining": max(remaining, 0),
+        "slices": executed,
+        "price": fill_price
+    }
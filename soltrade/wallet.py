@@ -6,11 +6,15 @@ from solana.rpc.types import TokenAccountOpts
 
 from soltrade.utils import handle_rate_limiting
 from soltrade.config import config
+from soltrade.paper import paper_wallet
 
 
 # Returns the current balance of token in the wallet
 @handle_rate_limiting()
 def find_balance(token_mint: str) -> float:
+    if config().paper_trading:
+        return paper_wallet().balance(token_mint)
+
     if token_mint == config().sol_mint:
         balance_response = config().client.get_balance(config().public_address).value
         balance_response = balance_response / (10 ** 9)
@@ -1,10 +1,18 @@
+import argparse
+
 import requests
 import pandas as pd
 
 import backtrader as bt
 
+from fill_models import FillModel, FixedSlippage, VolumeScaledSlippage, FixedDelay, LatencyDelay, FlatFeeCommission
+
+BAR_SECONDS = 5 * 60
+
 
 class SoltradeStrategy(bt.Strategy):
+    params = (('fill_model', None),)
+
     def __init__(self):
         self.rsi = bt.ind.RSI(self.data.close, period=14)
         self.bb = bt.ind.BollingerBands(self.data.close, period=14)
@@ -12,19 +20,49 @@ class SoltradeStrategy(bt.Strategy):
         self.ema_medium = bt.ind.ExponentialMovingAverage(self.data.close, period=20)
         self.stoploss = 0
         self.takeprofit = 0
+        self.fill_model = self.p.fill_model or FillModel()
+        self.pending = None  # (bar to execute on, is_buy) while a signal waits out its execution delay
 
     def next(self):
+        if self.pending:
+            execute_bar, is_buy = self.pending
+            if len(self) >= execute_bar:
+                self.pending = None
+                self.execute(is_buy)
+            return
 
         if not self.position:
             if self.data.close <= self.stoploss or self.data.close >= self.takeprofit:
                 self.close()
             if (self.ema_short > self.ema_medium or self.data.close < self.bb.lines.bot) and self.rsi <= 31:
-                self.buy()
-                self.stoploss = self.data.close * 0.925
-                self.takeprofit = self.data.close * 1.25
+                self.signal(is_buy=True)
         else:
             if (self.ema_short < self.ema_medium or self.data.close > self.bb.lines.top) and self.rsi >= 68:
-                self.close()
+                self.signal(is_buy=False)
+
+    # Queues the trade until the fill model's execution delay has passed
+    def signal(self, is_buy):
+        delay = self.fill_model.delay.delay_bars()
+        if delay == 0:
+            self.execute(is_buy)
+        else:
+            self.pending = (len(self) + delay, is_buy)
+
+    # Fills at the current bar's close, moved against us by the fill model's slippage
+    def execute(self, is_buy):
+        size = self.getsizing(isbuy=True) if is_buy else self.position.size
+        if size <= 0:
+            return
+
+        slippage = self.fill_model.slippage_perc(size, self.data.volume[0])
+        self.broker.set_slippage_perc(slippage, slip_open=True, slip_limit=True, slip_match=True, slip_out=True)
+
+        if is_buy:
+            self.buy(size=size)
+            self.stoploss = self.data.close * 0.925
+            self.takeprofit = self.data.close * 1.25
+        else:
+            self.close()
 
 
 def format_data():
@@ -45,10 +83,51 @@ def format_data():
     return formatted_df
 
 
-data = bt.feeds.PandasData(dataname=format_data())
+def build_fill_model(args) -> FillModel:
+    if args.volume_impact_bps > 0:
+        slippage = VolumeScaledSlippage(base_bps=args.slippage_bps, impact_bps=args.volume_impact_bps)
+    else:
+        slippage = FixedSlippage(bps=args.slippage_bps)
+
+    if args.latency_file:
+        delay = LatencyDelay.from_file(args.latency_file, bar_seconds=BAR_SECONDS, seed=args.seed)
+    else:
+        delay = FixedDelay(bars=args.delay_bars)
+
+    return FillModel(slippage=slippage, fee=args.fee, delay=delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the soltrade strategy with a configurable fill model.")
+    parser.add_argument("--slippage-bps", type=float, default=0, help="Slippage charged on every fill")
+    parser.add_argument("--volume-impact-bps", type=float, default=0, help="Extra slippage when an order matches the whole bar volume")
+    parser.add_argument("--fee", type=float, default=0, help="Flat fee per trade in the quote currency (e.g. 0.04)")
+    parser.add_argument("--delay-bars", type=int, default=0, help="Bars between the signal and the fill")
+    parser.add_argument("--latency-file", default="", help="Sample the delay from latencies written via EXECUTION_LATENCY_PATH")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency sampling")
+    parser.add_argument("--cash", type=float, default=10000)
+    parser.add_argument("--no-plot", action="store_true")
+    args = parser.parse_args()
+
+    fill_model = build_fill_model(args)
+    data = bt.feeds.PandasData(dataname=format_data())
+
+    cerebro = bt.Cerebro()
+    cerebro.addstrategy(SoltradeStrategy, fill_model=fill_model)
+    cerebro.adddata(data)
+    # Fill market orders at the close of the bar they are placed on, like the live bot
+    cerebro.broker.set_coc(True)
+    cerebro.broker.setcash(args.cash)
+    cerebro.broker.addcommissioninfo(FlatFeeCommission(fee=fill_model.fee))
+    # The live bot swaps its whole balance; keep headroom for slippage and fees
+    cerebro.addsizer(bt.sizers.AllInSizer, percents=95)
+    cerebro.run()
+
+    net_pnl = cerebro.broker.getvalue() - args.cash
+    print(f"Final value: {cerebro.broker.getvalue():.2f} (net PnL {net_pnl:+.2f})")
+    if not args.no_plot:
+        cerebro.plot()
+
 
-cerebro = bt.Cerebro()
-cerebro.addstrategy(SoltradeStrategy)
-cerebro.adddata(data)
-cerebro.run()
-cerebro.plot()
+if __name__ == "__main__":
+    main()
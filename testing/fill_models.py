@@ -0,0 +1,76 @@
+import math
+import random
+
+import backtrader as bt
+
+
+# Charges the same slippage on every fill, in basis points of the price
+class FixedSlippage:
+    def __init__(self, bps=0.0):
+        self.bps = bps
+
+    def slippage(self, size, volume) -> float:
+        return self.bps / 10000
+
+
+# Adds slippage that grows with the order's share of the bar volume
+class VolumeScaledSlippage:
+    def __init__(self, base_bps=0.0, impact_bps=0.0):
+        self.base_bps = base_bps
+        self.impact_bps = impact_bps  # Extra bps charged when the order equals the whole bar volume
+
+    def slippage(self, size, volume) -> float:
+        participation = abs(size) / volume if volume > 0 else 1
+        return (self.base_bps + self.impact_bps * participation) / 10000
+
+
+# Delays every fill by the same number of bars, 0 fills at the signal bar's close
+class FixedDelay:
+    def __init__(self, bars=0):
+        self.bars = bars
+
+    def delay_bars(self) -> int:
+        return self.bars
+
+
+# Delays each fill by a latency drawn from those recorded in production
+class LatencyDelay:
+    def __init__(self, latencies, bar_seconds, seed=None):
+        if not latencies:
+            raise ValueError("LatencyDelay needs at least one recorded latency.")
+        self.latencies = latencies
+        self.bar_seconds = bar_seconds
+        self.random = random.Random(seed)
+
+    # Reads the "timestamp,seconds" lines written via EXECUTION_LATENCY_PATH
+    @classmethod
+    def from_file(cls, path, bar_seconds, seed=None):
+        with open(path, 'r') as file:
+            latencies = [float(line.split(",")[1]) for line in file if line.strip()]
+        return cls(latencies, bar_seconds, seed=seed)
+
+    def delay_bars(self) -> int:
+        return math.ceil(self.random.choice(self.latencies) / self.bar_seconds)
+
+
+class FillModel:
+    def __init__(self, slippage=None, fee=0.0, delay=None):
+        self.slippage = slippage or FixedSlippage()
+        self.fee = fee  # Flat fee charged per trade, e.g. the Jupiter priority fee
+        self.delay = delay or FixedDelay()
+
+    # Fraction of the price lost to slippage when filling `size` in a bar trading `volume`
+    def slippage_perc(self, size, volume) -> float:
+        return self.slippage.slippage(size, volume)
+
+
+# Charges FillModel.fee on every executed order
+class FlatFeeCommission(bt.CommInfoBase):
+    params = (
+        ('fee', 0.0),
+        ('stocklike', True),
+        ('commtype', bt.CommInfoBase.COMM_FIXED),
+    )
+
+    def _getcommission(self, size, price, pseudoexec):
+        return self.p.fee